@@ -1,6 +1,6 @@
 import logging
 import time
-from db import get_connection, fetch_all_stats, run_agg_query
+from db import get_connection, fetch_all_stats, run_agg_query, bump_generation
 from stats import Stats, fmt
 
 AGG_QUERY = """
@@ -38,6 +38,7 @@ def main():
 
         # Run aggregation query
         run_agg_query(conn, AGG_QUERY)
+        bump_generation(conn, "weather_yearly_stats")
 
         # Fetch stats after aggregation
         after = { (sid, yr): Stats(tmax, tmin, precip)
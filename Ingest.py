@@ -3,15 +3,18 @@ from __future__ import annotations
 import logging
 from datetime import datetime as dt
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
-from sqlalchemy import create_engine
+import numpy as np
+
+from sqlalchemy import create_engine, delete
 from sqlalchemy.engine import Result
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from model import Base, Station, DailyWeather
+from model import Base, Station, DailyWeather, DailyWeatherQuarantine
+from validation import MISSING, RULE_SETS, Columns, load_columns, reason_counts, validate
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Paths / constants
@@ -20,39 +23,74 @@ DB_URL  = "sqlite:///weather.db"          # change to Postgres URL if desired
 WX_DIR  = Path("wx_data")                 # raw files folder
 LOG_DIR = Path("logs"); LOG_DIR.mkdir(exist_ok=True)
 
+RULE_SET = "default"                      # see validation.RULE_SETS
+
 BATCH_SIZE_SQLITE   = 180     # 180 × 5 params = 900 < 999
+BATCH_SIZE_SQLITE_QUARANTINE = 140   # 140 × 7 params = 980 < 999
+BATCH_SIZE_SQLITE_DELETE = 900       # 1 + 900 params < 999
 BATCH_SIZE_POSTGRES = 10_000
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Logging
 # ────────────────────────────────────────────────────────────────────────────────
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%H:%M:%S",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(LOG_DIR / "ingest.log", mode="a", encoding="utf-8"),
-    ],
-)
+def _configure_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(LOG_DIR / "ingest.log", mode="a", encoding="utf-8"),
+        ],
+    )
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ────────────────────────────────────────────────────────────────────────────────
 
-def _nullify(raw: str) -> int | None:
-    val = int(raw)
-    return None if val == -9999 else val
+def _nullify(col: np.ndarray) -> list[int | None]:
+    return [None if v == MISSING else v for v in col.tolist()]
+
+
+def _daily_rows(station_id: str, cols: Columns, ok: np.ndarray) -> List[dict[str, object]]:
+    dates = np.datetime_as_string(cols.date[ok], unit="D").tolist()
+    return [
+        {"station_id": station_id, "date": d,
+         "tmax_tc10": tmax, "tmin_tc10": tmin, "precip_tmm10": precip}
+        for d, tmax, tmin, precip in zip(
+            dates, _nullify(cols.tmax[ok]), _nullify(cols.tmin[ok]), _nullify(cols.precip[ok]),
+        )
+    ]
+
+
+def _quarantine_rows(station_id: str, cols: Columns, bad: np.ndarray,
+                     reasons: np.ndarray) -> List[dict[str, object]]:
+    raw_dates = [None if m else str(d) for m, d in
+                 zip(cols.malformed[bad].tolist(), cols.raw_date[bad].tolist())]
+    return [
+        {"station_id": station_id, "line_no": line_no, "raw_date": raw_date,
+         "tmax_tc10": tmax, "tmin_tc10": tmin, "precip_tmm10": precip, "reason": reason}
+        for line_no, raw_date, tmax, tmin, precip, reason in zip(
+            cols.line_no[bad].tolist(), raw_dates, _nullify(cols.tmax[bad]),
+            _nullify(cols.tmin[bad]), _nullify(cols.precip[bad]), reasons[bad].tolist(),
+        )
+    ]
+
 
+def _stale_dates(cols: Columns, ok: np.ndarray) -> List[str]:
+    """Dates of quarantined rows that no accepted row of the file supplies.
 
-def _parse_line(line: str):
-    date_str, tmax, tmin, precip = line.rstrip().split("\t")
-    return {
-        "date": dt.strptime(date_str, "%Y%m%d").date(),
-        "tmax_tc10": _nullify(tmax),
-        "tmin_tc10": _nullify(tmin),
-        "precip_tmm10": _nullify(precip),
-    }
+    A DUP_DATE repeat shares its date with the accepted first occurrence, so
+    that key is kept.
+    """
+    bad_dates = cols.date[~ok]
+    stale = np.setdiff1d(bad_dates[~np.isnat(bad_dates)], cols.date[ok])
+    return np.datetime_as_string(stale, unit="D").tolist()
+
+
+def _batches(rows: list, size: int) -> Iterator[list]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Ingest
@@ -60,12 +98,15 @@ def _parse_line(line: str):
 
 def ingest() -> None:
     start = dt.now()
-    total_new = total_dup = 0
+    total_new = total_dup = total_rejected = 0
+    rules = RULE_SETS[RULE_SET]
 
     engine = create_engine(DB_URL, future=True)
     Base.metadata.create_all(engine)
     is_sqlite = engine.url.get_backend_name() == "sqlite"
     batch_size = BATCH_SIZE_SQLITE if is_sqlite else BATCH_SIZE_POSTGRES
+    q_batch_size = BATCH_SIZE_SQLITE_QUARANTINE if is_sqlite else BATCH_SIZE_POSTGRES
+    d_batch_size = BATCH_SIZE_SQLITE_DELETE if is_sqlite else BATCH_SIZE_POSTGRES
 
     with Session(engine) as session:
         for filepath in sorted(WX_DIR.glob("US*.txt")):
@@ -80,52 +121,80 @@ def ingest() -> None:
             )
             session.execute(stmt_station)
 
-            buf: List[dict[str, object]] = []
+            # Validate the whole file column-wise, then split good / bad rows
+            cols = load_columns(filepath)
+            ok, reasons = validate(cols, rules)
+            bad = ~ok
             file_new = file_dup = 0
 
-            with filepath.open() as fh:
-                for line in fh:
-                    buf.append({"station_id": station_id, **_parse_line(line)})
-                    if len(buf) == batch_size:
-                        n_new, n_dup = _flush(buf, session, is_sqlite)
-                        file_new += n_new; file_dup += n_dup
-
-            if buf:
+            for buf in _batches(_daily_rows(station_id, cols, ok), batch_size):
                 n_new, n_dup = _flush(buf, session, is_sqlite)
                 file_new += n_new; file_dup += n_dup
 
+            # The quarantine always mirrors the current file and rule set
+            session.execute(
+                delete(DailyWeatherQuarantine)
+                .where(DailyWeatherQuarantine.station_id == station_id)
+            )
+
+            file_rejected, file_removed = int(bad.sum()), 0
+            if file_rejected:
+                q_rows = _quarantine_rows(station_id, cols, bad, reasons)
+                for buf in _batches(q_rows, q_batch_size):
+                    _flush(buf, session, is_sqlite, DailyWeatherQuarantine)
+
+                # Rows loaded by an earlier run (or before validation existed)
+                # must not stay in weather_daily once they are quarantined.
+                for keys in _batches(_stale_dates(cols, ok), d_batch_size):
+                    file_removed += session.execute(
+                        delete(DailyWeather)
+                        .where(DailyWeather.station_id == station_id)
+                        .where(DailyWeather.date.in_(keys))
+                    ).rowcount or 0
+
             session.commit()  # commit per file
-            total_new += file_new; total_dup += file_dup
-            logging.info("  ↳ %s new · %s dup", f"{file_new:,}", f"{file_dup:,}")
+            total_new += file_new; total_dup += file_dup; total_rejected += file_rejected
+            logging.info(
+                "  ↳ %s new · %s dup · %s rejected",
+                f"{file_new:,}", f"{file_dup:,}", f"{file_rejected:,}",
+            )
+            if file_removed:
+                logging.warning("    removed %s previously loaded rows", f"{file_removed:,}")
+            if file_rejected:
+                logging.warning(
+                    "    rejected by rule: %s",
+                    ", ".join(f"{code}={n:,}" for code, n in reason_counts(reasons[bad]).items()),
+                )
 
     secs = (dt.now() - start).total_seconds()
     logging.info(
-        "Done: %s new · %s dup · %.1f s elapsed",
-        f"{total_new:,}", f"{total_dup:,}", secs,
+        "Done: %s new · %s dup · %s rejected · %.1f s elapsed",
+        f"{total_new:,}", f"{total_dup:,}", f"{total_rejected:,}", secs,
     )
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Flush helper
 # ────────────────────────────────────────────────────────────────────────────────
 
-def _flush(buf: list[dict[str, object]], session: Session, is_sqlite: bool) -> Tuple[int, int]:
+def _flush(buf: list[dict[str, object]], session: Session, is_sqlite: bool,
+           model=DailyWeather) -> Tuple[int, int]:
     if not buf:
         return 0, 0
 
     stmt = (
-        (sqlite_insert if is_sqlite else pg_insert)(DailyWeather)
+        (sqlite_insert if is_sqlite else pg_insert)(model)
         .values(buf)
-        .on_conflict_do_nothing(index_elements=["station_id", "date"])
+        .on_conflict_do_nothing(index_elements=[c.name for c in model.__table__.primary_key])
     )
     result: Result = session.execute(stmt)
 
     inserted = result.rowcount or 0       # rowcount excludes skipped rows
     duplicates = len(buf) - inserted
-    buf.clear()
     return inserted, duplicates
 
 
 if __name__ == "__main__":
+    _configure_logging()
     try:
         ingest()
     except KeyboardInterrupt:
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime as dt
+from pathlib import Path
+
+import numpy as np
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from db import bump_generation
+from model import Base, CropYield
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Paths / constants
+# ────────────────────────────────────────────────────────────────────────────────
+DB_URL  = "sqlite:///weather.db"          # change to Postgres URL if desired
+YLD_DIR = Path("code-challenge-template-main/code-challenge-template-main/yld_data")
+LOG_DIR = Path("logs"); LOG_DIR.mkdir(exist_ok=True)
+
+BATCH_SIZE_SQLITE   = 300     # 300 × 3 params = 900 < 999
+BATCH_SIZE_POSTGRES = 10_000
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Logging
+# ────────────────────────────────────────────────────────────────────────────────
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+    handlers=[
+        logging.StreamHandler(),
+        logging.FileHandler(LOG_DIR / "ingest_yield.log", mode="a", encoding="utf-8"),
+    ],
+)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Ingest
+# ────────────────────────────────────────────────────────────────────────────────
+
+def ingest_yield() -> None:
+    """Bulk-load every ``yld_data/*.txt`` file (year <TAB> yield) into crop_yield.
+
+    Re-running is safe: existing (crop, year) rows are overwritten with the
+    file's value, and the ``crop_yield`` data generation is bumped so cached
+    correlation results are recomputed.
+    """
+    start = dt.now()
+    total = 0
+
+    engine = create_engine(DB_URL, future=True)
+    Base.metadata.create_all(engine)
+    is_sqlite = engine.url.get_backend_name() == "sqlite"
+    batch_size = BATCH_SIZE_SQLITE if is_sqlite else BATCH_SIZE_POSTGRES
+
+    with Session(engine) as session:
+        for filepath in sorted(YLD_DIR.glob("*.txt")):
+            crop = filepath.stem
+            logging.info("Processing %-24s …", crop)
+
+            years, values = np.loadtxt(filepath, dtype=np.int64, ndmin=2).reshape(-1, 2).T
+            rows = [
+                {"crop": crop, "year": year, "yield_value": value}
+                for year, value in zip(years.tolist(), values.tolist())
+            ]
+            for i in range(0, len(rows), batch_size):
+                _upsert(rows[i:i + batch_size], session, is_sqlite)
+
+            total += len(rows)
+            logging.info("  ↳ %s rows", f"{len(rows):,}")
+
+        bump_generation(session.connection(), "crop_yield")
+        session.commit()
+
+    secs = (dt.now() - start).total_seconds()
+    logging.info("Done: %s rows · %.1f s elapsed", f"{total:,}", secs)
+
+
+def _upsert(buf: list[dict[str, object]], session: Session, is_sqlite: bool) -> None:
+    stmt = (sqlite_insert if is_sqlite else pg_insert)(CropYield).values(buf)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["crop", "year"],
+        set_={"yield_value": stmt.excluded.yield_value},
+    )
+    session.execute(stmt)
+
+
+if __name__ == "__main__":
+    ingest_yield()
@@ -16,6 +16,7 @@ from pathlib import Path
 # ---------------------------------------------------------------------------
 PACKAGES = [
     "SQLAlchemy>=2.0",   # ORM / DB
+    "numpy",             # Column-wise validation (validation.py)
     "flask",             # Web framework
     "flask-restx",       # API + Swagger docs
     "tabulate",          # Pretty CLI tables (check_counts.py)
@@ -0,0 +1,110 @@
+import math
+import threading
+from collections import OrderedDict
+from sqlalchemy import inspect, text
+
+METRICS = ("avg_tmax_c", "avg_tmin_c", "total_precip_cm")
+
+# Station ids look like USC00SSnnnn – SS is the state code (11 = IL, 13 = IA, …).
+# Per (crop, state) the query returns n, means and centred sums of squares, so
+# every regression is computed in one pass inside the database.
+CORRELATION_QUERY = """
+WITH state_year AS (
+    SELECT substr(station_id, 6, 2) AS state, year, AVG({metric}) AS x
+    FROM weather_yearly_stats
+    WHERE {metric} IS NOT NULL{year_filter}
+    GROUP BY substr(station_id, 6, 2), year
+),
+joined AS (
+    SELECT cy.crop, sy.state, sy.x, cy.yield_value AS y,
+           AVG(sy.x)           OVER (PARTITION BY cy.crop, sy.state) AS mx,
+           AVG(cy.yield_value) OVER (PARTITION BY cy.crop, sy.state) AS my
+    FROM state_year sy
+    JOIN crop_yield cy ON cy.year = sy.year
+    WHERE cy.yield_value IS NOT NULL
+)
+SELECT crop, state, COUNT(*) AS n, AVG(mx) AS mx, AVG(my) AS my,
+       SUM((x - mx) * (x - mx)) AS sxx,
+       SUM((y - my) * (y - my)) AS syy,
+       SUM((x - mx) * (y - my)) AS sxy
+FROM joined
+GROUP BY crop, state
+ORDER BY crop, state
+"""
+
+# LRU of (metric, start_year, end_year) -> result, for _cache_generation only.
+# Years come straight from the query string, so the size must be capped.
+CACHE_MAXSIZE = 128
+_cache = OrderedDict()
+_cache_generation = None
+_cache_lock = threading.Lock()
+
+
+def _generation(db):
+    """Current data_generation counters; empty if the table doesn't exist yet."""
+    if not inspect(db.connection()).has_table("data_generation"):
+        return ()
+    rows = db.execute(text("SELECT name, generation FROM data_generation ORDER BY name"))
+    return tuple(rows)
+
+
+def _fit(crop, state, n, mx, my, sxx, syy, sxy):
+    """Pearson r and least-squares line ``yield = intercept + slope * metric``."""
+    slope = intercept = r = None
+    if n >= 2 and sxx:
+        slope = sxy / sxx
+        intercept = my - slope * mx
+        if syy:
+            r = sxy / math.sqrt(sxx * syy)
+    return {
+        "crop": crop,
+        "state": state,
+        "n_years": n,
+        "pearson_r": r,
+        "r_squared": None if r is None else r * r,
+        "slope": slope,
+        "intercept": intercept,
+    }
+
+
+def yield_correlation(db, metric, start_year=None, end_year=None):
+    """Correlate state-wide yearly *metric* with crop yield, cached per data generation."""
+    global _cache_generation
+
+    if metric not in METRICS:          # metric is interpolated into the SQL
+        raise ValueError(f"Unknown metric {metric!r}")
+    generation = _generation(db)
+    key = (metric, start_year, end_year)
+    with _cache_lock:
+        if generation != _cache_generation:
+            # Entries from an older generation can never be served again
+            _cache.clear()
+            _cache_generation = generation
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return hit
+
+    year_filter, params = "", {}
+    if start_year is not None:
+        year_filter += " AND year >= :start_year"
+        params["start_year"] = start_year
+    if end_year is not None:
+        year_filter += " AND year <= :end_year"
+        params["end_year"] = end_year
+
+    sql = CORRELATION_QUERY.format(metric=metric, year_filter=year_filter)
+    result = {
+        "metric": metric,
+        "start_year": start_year,
+        "end_year": end_year,
+        "data": [_fit(*row) for row in db.execute(text(sql), params)],
+    }
+
+    with _cache_lock:
+        if generation == _cache_generation:
+            _cache[key] = result
+            _cache.move_to_end(key)
+            while len(_cache) > CACHE_MAXSIZE:
+                _cache.popitem(last=False)
+    return result
@@ -44,10 +44,33 @@ def register_models(api):
             "data": fields.List(fields.Nested(yearly_model)),
         },
     )
+    correlation_model = api.model(
+        "YieldCorrelation",
+        {
+            "crop": fields.String,
+            "state": fields.String(example="11"),
+            "n_years": fields.Integer,
+            "pearson_r": fields.Float,
+            "r_squared": fields.Float,
+            "slope": fields.Float,
+            "intercept": fields.Float,
+        },
+    )
+    correlation_result = api.model(
+        "YieldCorrelationResult",
+        {
+            "metric": fields.String(example="avg_tmax_c"),
+            "start_year": fields.Integer,
+            "end_year": fields.Integer,
+            "data": fields.List(fields.Nested(correlation_model)),
+        },
+    )
     return {
         "weather_model": weather_model,
         "yearly_model": yearly_model,
         "meta_model": meta_model,
         "paginated_weather": paginated_weather,
         "paginated_yearly": paginated_yearly,
+        "correlation_model": correlation_model,
+        "correlation_result": correlation_result,
     }
\ No newline at end of file
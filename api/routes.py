@@ -3,6 +3,7 @@ from flask import request
 from sqlalchemy import select
 from model import DailyWeather, WeatherYearlyStats
 from api.pagination import paginate, get_pagination_params
+from api.correlation import METRICS, yield_correlation
 
 def register_routes(api, ns, SessionLocal, models):
     @ns.route("/weather")
@@ -65,4 +66,31 @@ def register_routes(api, ns, SessionLocal, models):
                     api.abort(404, "Page out of range")
                 return {"meta": meta, "data": rows}
             finally:
-                db.close()
\ No newline at end of file
+                db.close()
+
+    @ns.route("/yield/correlation")
+    class YieldCorrelationAPI(Resource):
+        @ns.doc(params={
+            "metric": "Yearly stat to correlate: " + ", ".join(METRICS),
+            "start_year": "First year (inclusive)",
+            "end_year": "Last year (inclusive)",
+        })
+        @ns.marshal_with(models["correlation_result"])
+        def get(self):
+            db = SessionLocal()
+            try:
+                metric = request.args.get("metric")
+                if metric not in METRICS:
+                    api.abort(400, "metric must be one of: " + ", ".join(METRICS))
+                start_str = request.args.get("start_year")
+                end_str = request.args.get("end_year")
+                try:
+                    start_year = int(start_str) if start_str else None
+                    end_year = int(end_str) if end_str else None
+                except ValueError:
+                    api.abort(400, "Invalid start_year or end_year parameter")
+                if start_year is not None and end_year is not None and start_year > end_year:
+                    api.abort(400, "start_year must not be after end_year")
+                return yield_correlation(db, metric, start_year, end_year)
+            finally:
+                db.close()
@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Connection, Result
 
+from model import DataGeneration
+
 engine = create_engine("sqlite:///weather.db", future=True)
 
 def get_connection():
@@ -14,4 +16,13 @@ def fetch_all_stats(conn: Connection):
 
 def run_agg_query(conn: Connection, agg_query: str):
     conn.execute(text("DELETE FROM weather_yearly_stats"))
-    conn.execute(text(agg_query))
\ No newline at end of file
+    conn.execute(text(agg_query))
+
+def bump_generation(conn: Connection, name: str):
+    """Mark *name* as changed so cached results built on it are discarded."""
+    # Databases created before data_generation existed don't have the table yet
+    DataGeneration.__table__.create(conn, checkfirst=True)
+    conn.execute(text(
+        "INSERT INTO data_generation (name, generation) VALUES (:name, 1) "
+        "ON CONFLICT (name) DO UPDATE SET generation = data_generation.generation + 1"),
+        {"name": name})
@@ -42,6 +42,19 @@ class DailyWeather(Base):
 
     station = relationship("Station", back_populates="daily")
 
+# ------------------------------------------------------------------
+# Rows rejected by validation.py during ingest
+# ------------------------------------------------------------------
+class DailyWeatherQuarantine(Base):
+    __tablename__ = "weather_daily_quarantine"
+    station_id = Column(String(11), ForeignKey("station.id"), primary_key=True)
+    line_no    = Column(Integer, primary_key=True)         # 1-based line in file
+    raw_date   = Column(String)                            # YYYYMMDD as in file; NULL if BAD_ROW
+    tmax_tc10  = Column(Integer)
+    tmin_tc10  = Column(Integer)
+    precip_tmm10 = Column(Integer)
+    reason     = Column(String, nullable=False)            # e.g. "TMIN_GT_TMAX;NEG_PRECIP"
+
 # ------------------------------------------------------------------
 # Yearly aggregates  (Problem 3)
 # ------------------------------------------------------------------
@@ -61,3 +74,22 @@ class WeatherYearlyStats(Base):
 
     # **make sure the string matches Station.yearly**
     station = relationship("Station", back_populates="yearly")
+
+# ------------------------------------------------------------------
+# Crop yield per year (yld_data/*.txt)
+# ------------------------------------------------------------------
+class CropYield(Base):
+    __tablename__ = "crop_yield"
+
+    crop        = Column(String, primary_key=True)     # file stem, e.g. US_corn_grain_yield
+    year        = Column(Integer, primary_key=True)
+    yield_value = Column(Integer)                       # as published in the yield file
+
+# ------------------------------------------------------------------
+# Data generation counters – bumped whenever a derived table is rebuilt
+# ------------------------------------------------------------------
+class DataGeneration(Base):
+    __tablename__ = "data_generation"
+
+    name       = Column(String, primary_key=True)      # table name
+    generation = Column(Integer, nullable=False, default=0)
@@ -112,4 +112,28 @@ def test_stats_missing_params(client):
 def test_swagger_docs(client):
     rv = client.get("/docs")
     assert rv.status_code == 200
-    assert b"Swagger" in rv.data or b"OpenAPI" in rv.data
\ No newline at end of file
+    assert b"Swagger" in rv.data or b"OpenAPI" in rv.data
+
+# ---------------------------------------------------------------------------
+# Tests – /api/yield/correlation ---------------------------------------------
+# ---------------------------------------------------------------------------
+
+def test_yield_correlation_basic(client):
+    """Returns one fit per (crop, state) with r in [-1, 1]."""
+    rv = client.get("/api/yield/correlation?metric=avg_tmax_c&start_year=1985&end_year=2014")
+    assert rv.status_code == 200
+    body = rv.get_json()
+    assert body["metric"] == "avg_tmax_c"
+    assert body["data"], "No correlation rows—run Ingest_yield.py and Data_analysis.py first."
+    for r in body["data"]:
+        assert r["n_years"] >= 2
+        assert -1.0 <= r["pearson_r"] <= 1.0
+        assert abs(r["r_squared"] - r["pearson_r"] ** 2) < 1e-9
+
+
+def test_yield_correlation_bad_params(client):
+    assert client.get("/api/yield/correlation").status_code == 400
+    assert client.get("/api/yield/correlation?metric=bogus").status_code == 400
+    assert client.get("/api/yield/correlation?metric=avg_tmin_c&start_year=abc").status_code == 400
+    rv = client.get("/api/yield/correlation?metric=avg_tmin_c&start_year=2000&end_year=1990")
+    assert rv.status_code == 400
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from api import correlation
+from api.correlation import _fit, _generation, yield_correlation
+from db import bump_generation
+from model import Base, CropYield, DataGeneration, Station, WeatherYearlyStats
+
+# ---------------------------------------------------------------------------
+# Fixtures – a small throw-away database, independent of weather.db
+# ---------------------------------------------------------------------------
+
+YEARS = range(2000, 2005)
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'corr.db'}", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add(Station(id="USC00110001"))
+        for i, year in enumerate(YEARS):
+            s.add(WeatherYearlyStats(station_id="USC00110001", year=year,
+                                     avg_tmax_c=float(i), avg_tmin_c=0.0, total_precip_cm=1.0))
+            s.add(CropYield(crop="corn", year=year, yield_value=10 * i))
+        s.commit()
+    return engine
+
+
+@pytest.fixture()
+def db(engine, monkeypatch):
+    monkeypatch.setattr(correlation, "_cache", OrderedDict())
+    monkeypatch.setattr(correlation, "_cache_generation", None)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture()
+def query_count(engine):
+    """Number of times the correlation query has hit the database."""
+    calls = []
+
+    def _count(conn, cursor, statement, *args):
+        if "crop_yield" in statement and "SELECT" in statement:
+            calls.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    return calls
+
+# ---------------------------------------------------------------------------
+# Tests – caching
+# ---------------------------------------------------------------------------
+
+def test_repeat_query_is_cache_hit(db, query_count):
+    first = yield_correlation(db, "avg_tmax_c")
+    assert len(query_count) == 1
+    assert yield_correlation(db, "avg_tmax_c") is first
+    assert len(query_count) == 1
+
+
+def test_result_changes_only_after_bump(db, query_count):
+    before = yield_correlation(db, "avg_tmax_c")
+    assert before["data"][0]["pearson_r"] == pytest.approx(1.0)
+
+    db.execute(text("UPDATE crop_yield SET yield_value = 0 WHERE year = 2004"))
+    db.commit()
+    assert yield_correlation(db, "avg_tmax_c") == before      # no bump → cached
+    assert len(query_count) == 1
+
+    bump_generation(db.connection(), "crop_yield")
+    db.commit()
+    after = yield_correlation(db, "avg_tmax_c")
+    assert len(query_count) == 2
+    assert after["data"][0]["pearson_r"] != pytest.approx(1.0)
+
+
+def test_cache_is_bounded(db, monkeypatch):
+    monkeypatch.setattr(correlation, "CACHE_MAXSIZE", 2)
+    for start_year in YEARS:
+        yield_correlation(db, "avg_tmax_c", start_year=start_year)
+    assert list(correlation._cache) == [
+        ("avg_tmax_c", 2003, None), ("avg_tmax_c", 2004, None),
+    ]
+
+
+def test_missing_generation_table(engine, db):
+    DataGeneration.__table__.drop(engine)
+    assert _generation(db) == ()
+    assert yield_correlation(db, "avg_tmax_c")["data"]
+
+# ---------------------------------------------------------------------------
+# Tests – _fit edge cases
+# ---------------------------------------------------------------------------
+
+def test_fit_single_year():
+    r = _fit("corn", "11", 1, 2.0, 10.0, 0.0, 0.0, 0.0)
+    assert r["n_years"] == 1
+    assert r["pearson_r"] is r["r_squared"] is r["slope"] is r["intercept"] is None
+
+
+def test_fit_constant_metric():
+    r = _fit("corn", "11", 5, 2.0, 10.0, 0.0, 40.0, 0.0)
+    assert r["pearson_r"] is r["r_squared"] is r["slope"] is r["intercept"] is None
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import Ingest
+
+# ---------------------------------------------------------------------------
+# Fixtures – ingest a single station file into a throw-away database
+# ---------------------------------------------------------------------------
+
+STATION = "USC00000001"
+
+
+@pytest.fixture()
+def run_ingest(tmp_path, monkeypatch):
+    wx_dir = tmp_path / "wx_data"
+    wx_dir.mkdir()
+    db_url = f"sqlite:///{tmp_path / 'ingest.db'}"
+    monkeypatch.setattr(Ingest, "WX_DIR", wx_dir)
+    monkeypatch.setattr(Ingest, "DB_URL", db_url)
+
+    def _run(*lines):
+        (wx_dir / f"{STATION}.txt").write_text("".join(line + "\n" for line in lines))
+        Ingest.ingest()
+        with create_engine(db_url, future=True).connect() as conn:
+            daily = conn.execute(text(
+                "SELECT date FROM weather_daily ORDER BY date")).scalars().all()
+            quarantine = conn.execute(text(
+                "SELECT line_no, raw_date, tmax_tc10, tmin_tc10, reason "
+                "FROM weather_daily_quarantine ORDER BY line_no")).all()
+        return daily, [tuple(r) for r in quarantine]
+
+    return _run
+
+# ---------------------------------------------------------------------------
+# Tests – re-ingest keeps weather_daily and the quarantine consistent
+# ---------------------------------------------------------------------------
+
+def test_corrected_line_leaves_quarantine(run_ingest):
+    daily, quarantine = run_ingest("19850101\t  -22\t -128\t   94",
+                                   "19850102\t  -50\t   20\t    0")
+    assert daily == ["1985-01-01"]
+    assert quarantine == [(2, "19850102", -50, 20, "TMIN_GT_TMAX")]
+
+    daily, quarantine = run_ingest("19850101\t  -22\t -128\t   94",
+                                   "19850102\t   50\t   20\t    0")
+    assert daily == ["1985-01-01", "1985-01-02"]
+    assert quarantine == []
+
+
+def test_shifted_lines_replace_quarantine(run_ingest):
+    run_ingest("19850101\t  -22\t -128\t   94",
+               "19850102\t  -50\t   20\t    0")
+
+    # New first line; the old bad line is fixed and a new bad row lands on line 2
+    daily, quarantine = run_ingest("19841231\t  -10\t  -20\t    0",
+                                   "19850101\t  -22\t -128\t   -5",
+                                   "19850102\t   50\t   20\t    0")
+    assert daily == ["1984-12-31", "1985-01-02"]
+    assert quarantine == [(2, "19850101", -22, -128, "NEG_PRECIP")]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from validation import RULE_SETS, load_columns, reason_counts, validate
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+ROWS = [
+    "19850101\t  -22\t -128\t   94",   # ok
+    "19850102\t -122\t -217\t-9999",   # ok (missing precip)
+    "19850103\t  -50\t   20\t    0",   # tmin > tmax
+    "19850104\t  100\t   10\t   -5",   # negative precip
+    "19850102\t  -10\t  -20\t    0",   # duplicate of line 2
+    "19850230\t  100\t   10\t    0",   # not a calendar date
+    "19850105\t  900\t-9999\t    0",   # tmax out of range
+    "19850106\t-9999\t-9999\t-9999",   # all missing (strict only)
+]
+
+
+@pytest.fixture()
+def cols(tmp_path):
+    path = tmp_path / "USC00000000.txt"
+    path.write_text("\n".join(ROWS) + "\n")
+    return load_columns(path)
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_load_columns_parses_dates(cols):
+    assert np.datetime_as_string(cols.date[0], unit="D") == "1985-01-01"
+    assert np.isnat(cols.date[5])
+
+
+def test_default_rules(cols):
+    ok, reasons = validate(cols, RULE_SETS["default"])
+    assert ok.tolist() == [True, True, False, False, False, False, False, True]
+    assert reasons[2] == "TMIN_GT_TMAX"
+    assert reasons[3] == "NEG_PRECIP"
+    assert reasons[4] == "DUP_DATE"
+    assert reasons[5] == "BAD_DATE"
+    assert reasons[6] == "TMAX_RANGE"
+
+
+def test_strict_rules_add_checks(cols):
+    ok, reasons = validate(cols, RULE_SETS["strict"])
+    assert not ok[7]
+    assert reasons[7] == "ALL_MISSING"
+
+
+def test_minimal_rules_only_reject_bad_dates(cols):
+    ok, reasons = validate(cols, RULE_SETS["minimal"])
+    assert (~ok).nonzero()[0].tolist() == [5]
+    assert reasons[5] == "BAD_DATE"
+
+
+def test_multiple_reasons_and_counts(tmp_path):
+    path = tmp_path / "USC00000001.txt"
+    path.write_text("19850101\t  -50\t   20\t   -1\n")
+    ok, reasons = validate(load_columns(path), RULE_SETS["default"])
+    assert reasons[0] == "TMIN_GT_TMAX;NEG_PRECIP"
+    assert reason_counts(reasons[~ok]) == {"NEG_PRECIP": 1, "TMIN_GT_TMAX": 1}
+
+
+def test_malformed_lines_become_bad_rows(tmp_path):
+    """Blank lines are skipped, bad lines are flagged, line numbers are real."""
+    path = tmp_path / "USC00000002.txt"
+    path.write_text(
+        "19850101\t  -22\t -128\t   94\n"
+        "\n"
+        "19850102\t  -22\n"                 # too few fields
+        "19850103\t  abc\t -128\t   94\n"   # not an integer
+        "19850104\t  -22\t -128\t   94\n"
+    )
+    cols = load_columns(path)
+    assert cols.line_no.tolist() == [1, 3, 4, 5]
+    ok, reasons = validate(cols, RULE_SETS["strict"])
+    assert ok.tolist() == [True, False, False, True]
+    assert reasons.tolist() == ["", "BAD_ROW", "BAD_ROW", ""]
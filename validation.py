@@ -0,0 +1,189 @@
+"""Column-wise data-quality checks for raw daily weather files.
+
+A whole station file is loaded as NumPy columns and every rule is evaluated
+once over the full column, so the cost does not grow with a Python loop per
+row.  Failing rows are routed to ``weather_daily_quarantine`` by Ingest.py.
+
+Pick a rule set by name (see ``RULE_SETS``) – ``Ingest.RULE_SET`` selects the
+one used during ingest.
+"""
+from __future__ import annotations
+
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+MISSING = -9999                  # sentinel used in the raw files
+
+# Plausible ranges in raw tenths-°C / tenths-mm
+TEMP_MIN_TC10   = -600           # −60 °C
+TEMP_MAX_TC10   = 600            #  60 °C
+PRECIP_MAX_TMM10 = 10_000        # 1 000 mm in a day
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Column container
+# ────────────────────────────────────────────────────────────────────────────────
+# line_no  : int64   1-based line number in the file (blank lines are skipped)
+# malformed: bool    line is not four integer fields
+# raw_date : int64   YYYYMMDD exactly as in the file (0 where malformed)
+# date     : datetime64[D] (NaT where raw_date is not a calendar date)
+# tmax / tmin / precip : int64, MISSING kept as-is (MISSING where malformed)
+Columns = namedtuple("Columns", "line_no malformed raw_date date tmax tmin precip")
+
+Rule = namedtuple("Rule", "code check")     # check(cols) -> bool mask of failures
+
+
+def load_columns(filepath: Path) -> Columns:
+    """Read a tab-separated station file into columns in one pass.
+
+    Lines that are not four integer fields are kept as ``malformed`` rows so
+    the BAD_ROW rule can quarantine them instead of aborting the ingest.
+    """
+    lines = filepath.read_text().splitlines()
+    line_no = [i for i, line in enumerate(lines, 1) if line.strip()]
+    rows = lines if len(line_no) == len(lines) else [lines[i - 1] for i in line_no]
+
+    values = None
+    if rows:
+        try:
+            values = np.loadtxt(rows, dtype=np.int64, ndmin=2, comments=None)
+        except ValueError:
+            pass
+    if values is not None and values.shape[1] == 4:
+        malformed = np.zeros(len(rows), dtype=bool)
+    else:
+        values, malformed = _parse_rows(rows)   # only files with bad lines
+    values[malformed] = (0, MISSING, MISSING, MISSING)
+
+    raw_date, tmax, tmin, precip = values.T
+    return Columns(np.array(line_no, dtype=np.int64), malformed,
+                   raw_date, _to_datetime64(raw_date), tmax, tmin, precip)
+
+
+def _parse_rows(rows: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.zeros((len(rows), 4), dtype=np.int64)
+    malformed = np.zeros(len(rows), dtype=bool)
+    for i, row in enumerate(rows):
+        parts = row.split()
+        try:
+            if len(parts) != 4:
+                raise ValueError
+            values[i] = [int(x) for x in parts]
+        except ValueError:
+            malformed[i] = True
+    return values, malformed
+
+
+def _to_datetime64(raw_date: np.ndarray) -> np.ndarray:
+    year  = raw_date // 10_000
+    month = raw_date // 100 % 100
+    day   = raw_date % 100
+
+    ok = (month >= 1) & (month <= 12) & (day >= 1)
+    months = np.where(ok, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    first  = months.astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[D]") - first).astype(np.int64)
+    ok &= day <= days_in_month
+
+    dates = first + np.where(ok, day - 1, 0).astype("timedelta64[D]")
+    dates[~ok] = np.datetime64("NaT")
+    return dates
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Rules
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _present(col: np.ndarray) -> np.ndarray:
+    return col != MISSING
+
+
+def _bad_row(c: Columns) -> np.ndarray:
+    return c.malformed
+
+
+def _bad_date(c: Columns) -> np.ndarray:
+    return np.isnat(c.date) & ~c.malformed
+
+
+def _dup_date(c: Columns) -> np.ndarray:
+    """Every repeat of a date after its first occurrence in the file."""
+    dup = np.zeros(len(c.raw_date), dtype=bool)
+    rows = np.flatnonzero(~c.malformed)
+    _, first_idx = np.unique(c.raw_date[rows], return_index=True)
+    dup[rows] = True
+    dup[rows[first_idx]] = False
+    return dup
+
+
+def _tmin_gt_tmax(c: Columns) -> np.ndarray:
+    return _present(c.tmin) & _present(c.tmax) & (c.tmin > c.tmax)
+
+
+def _neg_precip(c: Columns) -> np.ndarray:
+    return _present(c.precip) & (c.precip < 0)
+
+
+def _temp_out_of_range(col: np.ndarray) -> np.ndarray:
+    return _present(col) & ((col < TEMP_MIN_TC10) | (col > TEMP_MAX_TC10))
+
+
+def _precip_out_of_range(c: Columns) -> np.ndarray:
+    return _present(c.precip) & (c.precip > PRECIP_MAX_TMM10)
+
+
+def _all_missing(c: Columns) -> np.ndarray:
+    return ~(_present(c.tmax) | _present(c.tmin) | _present(c.precip) | c.malformed)
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (
+    Rule("BAD_ROW",      _bad_row),
+    Rule("BAD_DATE",     _bad_date),
+    Rule("DUP_DATE",     _dup_date),
+    Rule("TMIN_GT_TMAX", _tmin_gt_tmax),
+    Rule("NEG_PRECIP",   _neg_precip),
+    Rule("TMAX_RANGE",   lambda c: _temp_out_of_range(c.tmax)),
+    Rule("TMIN_RANGE",   lambda c: _temp_out_of_range(c.tmin)),
+)
+
+RULE_SETS: Dict[str, Tuple[Rule, ...]] = {
+    "minimal": DEFAULT_RULES[:2],           # BAD_ROW / BAD_DATE are needed to build rows
+    "default": DEFAULT_RULES,
+    "strict":  DEFAULT_RULES + (
+        Rule("PRECIP_RANGE", _precip_out_of_range),
+        Rule("ALL_MISSING",  _all_missing),
+    ),
+}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Entry point
+# ────────────────────────────────────────────────────────────────────────────────
+
+def validate(cols: Columns, rules: Tuple[Rule, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Apply *rules* to every row at once.
+
+    Returns ``(ok, reasons)`` – a bool mask of rows that passed and, per row,
+    the ``;``-joined codes of every rule it failed (empty string if none).
+    """
+    n = len(cols.raw_date)
+    reasons = np.full(n, "", dtype=object)
+    ok = np.ones(n, dtype=bool)
+
+    for rule in rules:
+        failed = rule.check(cols)
+        if not failed.any():
+            continue
+        hit = reasons[failed]
+        reasons[failed] = np.where(hit == "", rule.code, hit + ";" + rule.code)
+        ok &= ~failed
+
+    return ok, reasons
+
+
+def reason_counts(reasons: np.ndarray) -> Dict[str, int]:
+    """Tally individual reason codes across rejected rows."""
+    codes, counts = np.unique(
+        [code for r in reasons if r for code in r.split(";")], return_counts=True,
+    )
+    return dict(zip(codes.tolist(), counts.tolist()))